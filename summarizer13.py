@@ -1,55 +1,79 @@
 import os
-import glob
+import sys
+import io
+import asyncio
+import hashlib
+import tempfile
+import random
 import argparse
+import logging
 import csv
+import itertools
 import webvtt
 import re
 from datetime import datetime, timedelta
 from collections import defaultdict
+import httpx
 from langchain_core.prompts import PromptTemplate
-from langchain_community.chat_models import ChatOllama
 
 # Initialize the LLM model
 local_llm = 'phi3:14b-medium-4k-instruct-q5_K_M'
-print(f"Initializing LLM for extraction: {local_llm}")
-model = ChatOllama(model=local_llm, temperature=0.1)
-
-# Define prompt templates for each pass
-overview_prompt = """
-You carefully provide accurate, factual, thoughtful, nuanced responses, and are brilliant at reasoning. Only output the summary which can include questions asked, any interesting quotes, and any action items that were discussed. 
-
-Analyze the following meeting transcript. Provide a comprehensive summary paragraph or two (250-400 words) that captures the key points discussed, decisions made, and the overall purpose of the meeting:
-
-Transcript:
+OLLAMA_HOST = os.environ.get("OLLAMA_HOST", "http://localhost:11434")
+if "://" not in OLLAMA_HOST:
+    OLLAMA_HOST = f"http://{OLLAMA_HOST}"
+
+logger = logging.getLogger(__name__)
+
+# Shared keep-alive connection pool to Ollama, opened and closed by main_async
+http_client = None
+# Caps in-flight LLM requests at --concurrency (match OLLAMA_NUM_PARALLEL), however many chunks are queued
+llm_slots = None
+
+# How long Ollama keeps the model loaded after each request; long enough to bridge the gaps
+# between files, short enough that the weights are released soon after the run ends
+KEEP_ALIVE = "15m"
+
+# Per-request timeout (seconds) and attempts before a call is given up on
+REQUEST_TIMEOUT = 300
+REQUEST_ATTEMPTS = 3
+
+# On-disk cache of LLM responses; bump PROMPT_VERSION to invalidate it after changing prompts
+CACHE_DIR = ".summary_cache"
+PROMPT_VERSION = "v3"
+
+# Every call must fit prompt + inserted text + answer into the 4k context. The answer is capped
+# with num_predict; token counts are estimated from characters, conservatively, because the
+# [HH:MM:SS] prefixes and names tokenize much denser than the usual 4 characters per token.
+CONTEXT_TOKENS = 4096
+ANSWER_TOKENS = 1536
+CHARS_PER_TOKEN = 3
+
+# The merged lists are capped at what the prompt used to ask for a whole meeting;
+# action items are never dropped
+MAX_ITEMS = {'Main Topics': 10, 'Decisions and Impact': 50, 'Action Items': None}
+
+# Single prompt asking for all four sections at once, so the transcript is only prefilled once.
+# The transcript comes first so repeated calls share a common prefix Ollama can reuse from its KV cache.
+combined_prompt = """Transcript:
 {transcript}
 
-Format your response as a single or double paragraph without bullet points. Do not repeat the prompt back, or say anything extra.
-"""
+---
+Instructions: You carefully provide accurate, factual, thoughtful, nuanced responses, and are brilliant at reasoning.
 
-main_topics_prompt = """
-List 5-10 main topics discussed in the following meeting transcript. Include a timestamp for each topic:
+Analyze the meeting transcript above and produce four sections, each starting with its delimiter line exactly as shown. Each transcript line starts with the [HH:MM:SS] time it was spoken; take every timestamp you give from these marks.
 
-Transcript:
-{transcript}
+===OVERVIEW===
+Provide a summary paragraph or two (150-250 words) that captures the key points discussed, decisions made, and the overall purpose of the meeting. It can include questions asked, any interesting quotes, and any action items that were discussed. Format it as a single or double paragraph without bullet points.
 
-Format your response as:
+===MAIN_TOPICS===
+List 3-6 main topics discussed in this transcript. Include the timestamp where each topic starts, formatted as:
 
 - Topic 1 (HH:MM:SS)
 - Topic 2 (HH:MM:SS)
 ...
 
-Only output the bullet points per section which can include questions asked, any interesting quotes, and any action items that were discussed.
-Do not repeat the prompt back, or say anything extra.
-Do not include any preamble, introduction or postscript about what you are doing. Assume I know.
-"""
-
-decisions_impact_prompt = """
-Extract 25-50 decisions from the following meeting transcript, including their potential impact and timestamps:
-
-Transcript:
-{transcript}
-
-Format your response as:
+===DECISIONS===
+Extract 5-10 decisions from this transcript, including their potential impact and timestamps, formatted as:
 
 - **Decision**: [Decision 1]
   - **Impact**: [Detailed impact of Decision 1]
@@ -57,88 +81,65 @@ Format your response as:
   - **Impact**: [Detailed impact of Decision 2]
 ...
 
-Only output the bullet points per section which can include questions asked, any interesting quotes, and any action items that were discussed. Do not repeat the prompt back, or say anything extra.
-
-Do not include any preamble, introduction or postscript about what you are doing. Assume I know.
-"""
-
-action_items_prompt = """
-List 5-10 action items from the following meeting transcript, including who they're assigned to (if mentioned), a detailed description, and timestamp:
-
-Transcript:
-{transcript}
-
-Format your response as:
+===ACTIONS===
+List up to 5 action items from this transcript, including who they're assigned to (if mentioned), a detailed description, and timestamp, formatted as:
 
 - **Item**: [Action item 1]
   - **Assigned to**: [Person assigned]
   - **Description**: [Detailed description of the action item]
 ...
 
-Only output the bullet points per section which can include questions asked, any interesting quotes, and any action items that were discussed. Do not repeat the prompt back, or say anything extra.
-
+Your response must contain the four delimiter lines (===OVERVIEW===, ===MAIN_TOPICS===, ===DECISIONS===, ===ACTIONS===), each followed by its section content.
+Only output the sections. Do not repeat the prompt back, or say anything extra.
 Do not include any preamble, introduction or postscript about what you are doing. Assume I know.
 """
 
-post_processing_prompt = """
-Review the following meeting summary sections and reformat them according to these strict guidelines:
-1. Provide exactly four main sections: Meeting Overview, Main Topics, Decisions and Impact, and Action Items.
-2. Do not add any additional headers or subheaders within these sections.
-3. Keep the Meeting Overview as a single paragraph without bullet points.
-4. Use bullet points (-) for all items within the Main Topics, Decisions and Impact, and Action Items sections.
-5. Ensure all timestamps are in the format (HH:MM:SS).
-6. Remove any unnecessary brackets or parentheses from the Main Topics.
-7. Combine similar points and remove redundancies.
-8. Keep the content single-spaced.
-9. Do not repeat the prompt back, or say anything extra.
-10. Do not include any preamble, introduction or postscript about what you are doing.
-
-Original content:
-{content}
+# Merges the per-chunk overviews of a long meeting back into one summary
+consolidate_overview_prompt = """Partial summaries:
+{overviews}
 
-Without repeating the prompt, or including a preamble, simply reformat the content to match this exact structure:
+---
+Instructions: The paragraphs above each summarize a consecutive part of the same meeting, in order. Merge them into one comprehensive summary paragraph or two (250-400 words) that captures the key points discussed, decisions made, and the overall purpose of the meeting.
 
-Meeting Overview
-[Single or double paragraph summary]
-
-Main Topics
-- Topic 1 (HH:MM:SS)
-- Topic 2 (HH:MM:SS)
-...
+Format your response as a single or double paragraph without bullet points. Do not repeat the prompt back, or say anything extra.
+"""
 
-Decisions and Impact
-- **Decision**: Decision 1
-  - **Impact**: Impact of Decision 1
-- **Decision**: Decision 2
-  - **Impact**: Impact of Decision 2
-...
+# Templates are static, so build them once instead of on every call
+COMBINED_TEMPLATE = PromptTemplate(template=combined_prompt, input_variables=["transcript"])
+CONSOLIDATE_OVERVIEW_TEMPLATE = PromptTemplate(template=consolidate_overview_prompt, input_variables=["overviews"])
 
-Action Items
-- **Item**: Action item 1
-  - **Assigned to**: Person assigned
-  - **Description**: Description of action item
-...
+# Transcript chunks and overview batches get whatever the context has left after the prompt and the answer
+CHUNK_TOKENS = CONTEXT_TOKENS - ANSWER_TOKENS - len(combined_prompt) // CHARS_PER_TOKEN
+OVERVIEW_BATCH_TOKENS = CONTEXT_TOKENS - ANSWER_TOKENS - len(consolidate_overview_prompt) // CHARS_PER_TOKEN
 
-"""
+# Precompiled patterns used when splitting LLM output into sections
+# Delimiter lines may come back wrapped in markdown (**===OVERVIEW===**, ## === MAIN TOPICS ===)
+_COMBINED_SPLIT_RE = re.compile(r'^[\s*#_`]*===\s*(OVERVIEW|MAIN[ _]TOPICS|DECISIONS|ACTIONS)\s*===[\s*#_`:]*$', re.MULTILINE | re.IGNORECASE)
+_VALID_HEADERS = frozenset({'Meeting Overview', 'Main Topics', 'Decisions and Impact', 'Action Items'})
+_SECTION_ORDER = ('Meeting Overview', 'Main Topics', 'Decisions and Impact', 'Action Items')
+# The model echoes chunk prefixes like [00:05:10] as often as it writes (00:05:10)
+_TIMESTAMP_RE = re.compile(r'[(\[](\d{1,2}:\d{2}(?::\d{2})?)[)\]]')
+_BULLET_RE = re.compile(r'^(?:[-*•+]|\d+[.)])\s+')
+_SUB_ITEM_RE = re.compile(r'^\*\*(?:Impact|Assigned to|Description)\*\*', re.IGNORECASE)
 
 def read_csv_file(file_path):
-    print(f"Reading CSV data from file: {file_path}")
-    participants = []
-    with open(file_path, mode='r', encoding='utf-8-sig') as file:
-        csv_reader = csv.reader(file)
-        for _ in range(4):  # Skip the first 4 lines
-            next(csv_reader)
-        for row in csv_reader:
-            if len(row) >= 3:
-                participants.append({"name": row[0].strip(), "total_duration": row[2].strip()})
-    return participants
+    logger.debug("Reading CSV data from file: %s", file_path)
+    with open(file_path, mode='r', encoding='utf-8-sig', newline='') as file:
+        # Skip the first 4 lines (report header)
+        return [
+            {"name": row[0].strip(), "total_duration": row[2].strip()}
+            for row in itertools.islice(csv.reader(file), 4, None)
+            if len(row) >= 3
+        ]
 
 def read_vtt_file(file_path):
-    print(f"Reading transcript from file: {file_path}")
-    vtt = webvtt.read(file_path)
-    transcript = " ".join([caption.text for caption in vtt])
-    print(f"Transcript length: {len(transcript)}")
-    return transcript
+    logger.debug("Reading transcript from file: %s", file_path)
+    # Keep each cue's start time (HH:MM:SS) so chunks can split on cue boundaries and cite real timestamps
+    captions = [(caption.start.split('.')[0], " ".join(caption.text.split())) for caption in webvtt.read(file_path)]
+    if not captions:
+        raise ValueError(f"No captions found in {file_path}")
+    logger.debug("Transcript captions: %d", len(captions))
+    return captions
 
 def format_timestamp(timestamp):
     try:
@@ -154,84 +155,354 @@ def format_timestamp(timestamp):
             seconds = int(float(timestamp))
             return str(timedelta(seconds=seconds))[:-3]  # Remove microseconds
     except ValueError:
-        print(f"Warning: Unable to convert timestamp '{timestamp}'. Keeping original format.")
+        logger.warning("Unable to convert timestamp '%s'. Keeping original format.", timestamp)
         return timestamp
 
-def extract_section(transcript, prompt_template):
-    prompt = PromptTemplate(template=prompt_template, input_variables=["transcript"])
-    query = prompt.format(transcript=transcript)
-    response = model.invoke(query)
-    return response.content
-
-def post_process_content(content):
-    prompt = PromptTemplate(template=post_processing_prompt, input_variables=["content"])
-    query = prompt.format(content=content)
-    response = model.invoke(query)
-    return response.content
-
-def structure_markdown(content, title, base_name, participants):
-    structured_content = f"# {base_name}\n\n"
+async def achat(prompt, model_name=local_llm, temperature=0.1):
+    # Talk to Ollama directly so every request reuses the pooled connections of http_client
+    payload = {
+        "model": model_name,
+        "messages": [{"role": "user", "content": prompt}],
+        "stream": False,
+        "keep_alive": KEEP_ALIVE,
+        "options": {"temperature": temperature, "num_ctx": CONTEXT_TOKENS, "num_predict": ANSWER_TOKENS},
+    }
+    response = await http_client.post("/api/chat", json=payload)
+    response.raise_for_status()
+    return response.json()["message"]["content"]
+
+async def awarm_up(model_name=local_llm):
+    # A request without a prompt just loads the model, so the first transcript doesn't pay for it
+    response = await http_client.post("/api/generate", json={
+        "model": model_name,
+        "keep_alive": KEEP_ALIVE,
+        "options": {"num_ctx": CONTEXT_TOKENS},
+    })
+    response.raise_for_status()
+
+async def arobust_chat(prompt, model_name=local_llm, timeout=REQUEST_TIMEOUT, attempts=REQUEST_ATTEMPTS):
+    # A stalled request, dropped connection or server error is retried with jittered exponential backoff
+    for attempt in range(attempts):
+        try:
+            # Waiting for a slot does not count against the request timeout
+            async with llm_slots:
+                return await asyncio.wait_for(achat(prompt, model_name), timeout)
+        except (asyncio.TimeoutError, httpx.TransportError, httpx.HTTPStatusError) as e:
+            # A 4xx (unknown model, bad request) fails the same way every time, so give up at once
+            if isinstance(e, httpx.HTTPStatusError) and e.response.status_code < 500:
+                raise
+            if attempt == attempts - 1:
+                raise
+            delay = 2 ** attempt + random.random()
+            logger.warning("LLM request failed (%r), retrying in %.1fs", e, delay)
+            await asyncio.sleep(delay)
+
+def _cache_key(*parts):
+    return hashlib.blake2b("\0".join(parts).encode('utf-8')).hexdigest()
+
+def _cache_get(key):
+    cache_path = os.path.join(CACHE_DIR, f"{key}.txt")
+    if not os.path.exists(cache_path):
+        return None
+    with open(cache_path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+def _cache_put(key, value):
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    # Write to a temp file first so concurrent workers never see a partial entry
+    fd, tmp_path = tempfile.mkstemp(dir=CACHE_DIR, suffix=".tmp")
+    with open(fd, 'w', encoding='utf-8') as f:
+        f.write(value)
+    os.replace(tmp_path, os.path.join(CACHE_DIR, f"{key}.txt"))
+
+async def acached_chat(query, model_name=local_llm, parse=None):
+    # parse runs before caching so a response it rejects is never stored
+    key = _cache_key(PROMPT_VERSION, model_name, query)
+    cached = await asyncio.to_thread(_cache_get, key)
+    if cached is not None:
+        try:
+            return parse(cached) if parse else cached
+        except ValueError:
+            logger.warning("Discarding unusable cached response %s", key)
+    for attempt in range(REQUEST_ATTEMPTS):
+        content = await arobust_chat(query, model_name)
+        try:
+            result = parse(content) if parse else content
+            break
+        except ValueError:
+            # An unusable answer is ordinary sampling variance, so ask again before giving up
+            if attempt == REQUEST_ATTEMPTS - 1:
+                raise
+            logger.warning("Unusable LLM response, retrying (attempt %d of %d)", attempt + 2, REQUEST_ATTEMPTS)
+    await asyncio.to_thread(_cache_put, key, content)
+    return result
+
+async def aextract_section(transcript, template):
+    query = template.format(transcript=transcript)
+    return await acached_chat(query, parse=split_combined_response)
+
+def batch_overviews(overviews, max_tokens=OVERVIEW_BATCH_TOKENS):
+    batches, batch, batch_chars = [], [], 0
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    for overview in overviews:
+        # Always put at least two overviews in a batch so every round of merging shrinks the list
+        if len(batch) >= 2 and batch_chars + len(overview) > max_chars:
+            batches.append(batch)
+            batch, batch_chars = [], 0
+        batch.append(overview)
+        batch_chars += len(overview)
+    if batch:
+        batches.append(batch)
+    return batches
+
+async def amerge_overviews(batch, model_name=local_llm):
+    if len(batch) == 1:
+        return batch[0]
+    query = CONSOLIDATE_OVERVIEW_TEMPLATE.format(overviews="\n\n".join(batch))
+    return await acached_chat(query, model_name)
+
+async def aconsolidate_overviews(overviews, model_name=local_llm):
+    # Merge batches that fit the context window, then merge the merged summaries until one is left
+    while len(overviews) > 1:
+        batches = batch_overviews(overviews)
+        overviews = await asyncio.gather(*(amerge_overviews(batch, model_name) for batch in batches))
+    return overviews[0]
+
+def chunk_transcript(captions, max_tokens=CHUNK_TOKENS):
+    # Split on cue boundaries, prefixing each cue with its start time
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    chunks = []
+    buffer = io.StringIO()
+    for start, text in captions:
+        line = f"[{start}] {text}\n"
+        if buffer.tell() and buffer.tell() + len(line) > max_chars:
+            chunks.append(buffer.getvalue())
+            buffer = io.StringIO()
+        buffer.write(line)
+    if buffer.tell():
+        chunks.append(buffer.getvalue())
+    return chunks
+
+def structure_markdown(sections, title, base_name, participants):
+    parts = [f"# {base_name}\n\n"]
     
-    sections = re.split(r'\n(?=(?:Meeting Overview|Main Topics|Decisions and Impact|Action Items))', content)
-    for section in sections:
-        lines = section.split('\n')
-        if lines:
-            header = lines[0].strip()
-            if header in ['Meeting Overview', 'Main Topics', 'Decisions and Impact', 'Action Items']:
-                structured_content += f"## {header}\n"
-                for line in lines[1:]:
-                    if line.strip():
-                        structured_content += f"{line}\n"
-            else:
-                for line in lines:
-                    if line.strip():
-                        structured_content += f"{line}\n"
-            structured_content += "\n"
+    for header in _SECTION_ORDER:
+        parts.append(f"## {header}\n")
+        parts.extend(f"{line}\n" for line in sections[header])
+        parts.append("\n")
     
-    structured_content += "## Participants\n"
-    for participant in participants:
-        structured_content += f"- {participant['name']} (Total Duration: {participant['total_duration']})\n"
-    
-    return structured_content
-
-def extract_meeting_notes(transcript, participants, title, base_name):
-    overview = extract_section(transcript, overview_prompt)
-    main_topics = extract_section(transcript, main_topics_prompt)
-    decisions_impact = extract_section(transcript, decisions_impact_prompt)
-    action_items = extract_section(transcript, action_items_prompt)
+    parts.append("## Participants\n")
+    parts.extend(f"- {participant['name']} (Total Duration: {participant['total_duration']})\n" for participant in participants)
     
-    content = f"Meeting Overview\n{overview}\n\nMain Topics\n{main_topics}\n\nDecisions and Impact\n{decisions_impact}\n\nAction Items\n{action_items}"
+    return parts
+
+def _is_stray_header(text):
+    return text.strip('#*: ') in _VALID_HEADERS
+
+def _pad_timestamp(timestamp):
+    # format_timestamp only prepends the hour, so (5:10) would become (00:5:10)
+    return ":".join(part.zfill(2) for part in format_timestamp(timestamp).split(':'))
+
+def _normalize_overview(lines):
+    normalized = []
+    for line in lines:
+        text = line.strip()
+        if not text or _is_stray_header(text):
+            continue
+        normalized.append(_BULLET_RE.sub('', text))
+    return normalized
+
+def _normalize_bullets(lines, strip_brackets=False, limit=None):
+    items = {}  # lowercased item text -> item lines, in first-seen order
+    current = None
+    for line in lines:
+        text = line.strip()
+        if not text or text == '...' or _is_stray_header(text):
+            continue
+        text = _BULLET_RE.sub('', text)
+        text = _TIMESTAMP_RE.sub(lambda m: f"({_pad_timestamp(m.group(1))})", text)
+        if strip_brackets:
+            text = text.replace('[', '').replace(']', '')
+        if current is not None and (line[:1].isspace() or _SUB_ITEM_RE.match(text)):
+            current.append(f"  - {text}")
+            continue
+        key = text.lower()
+        if key in items:
+            current = []  # duplicate item: drop it along with its sub-points
+        else:
+            current = items[key] = [f"- {text}"]
+    return [line for item in itertools.islice(items.values(), limit) for line in item]
+
+def normalize_sections(bodies):
+    # bodies maps each section header to its raw text; returns header -> formatted lines
+    normalized = {}
+    for header in _SECTION_ORDER:
+        lines = bodies.get(header, '').split('\n')
+        if header == 'Meeting Overview':
+            normalized[header] = _normalize_overview(lines)
+        else:
+            normalized[header] = _normalize_bullets(lines, strip_brackets=header == 'Main Topics', limit=MAX_ITEMS[header])
+    return normalized
+
+def split_combined_response(content):
+    parts = _COMBINED_SPLIT_RE.split(content)
+    if len(parts) == 1:
+        logger.warning("No section delimiters found in LLM response: %.200r", content)
+        raise ValueError("LLM response has no section delimiters")
+    sections = {}
+    # parts alternates [preamble, name, body, name, body, ...]
+    for name, body in zip(parts[1::2], parts[2::2]):
+        sections[name.upper().replace(' ', '_')] = body.strip()
+    return sections
+
+async def extract_meeting_notes(captions, participants, title, base_name, post_model=local_llm):
+    # One call per chunk produces all four sections; split them back out on the delimiters
+    chunks = chunk_transcript(captions)
+    chunk_sections = await asyncio.gather(*(aextract_section(chunk, COMBINED_TEMPLATE) for chunk in chunks))
+
+    # Lists are concatenated in chunk order and deduplicated by normalize_sections;
+    # overviews from several chunks need one more call to read as a single summary
+    overviews = [sections['OVERVIEW'] for sections in chunk_sections if sections.get('OVERVIEW')]
+    if len(overviews) > 1:
+        overview = await aconsolidate_overviews(overviews, post_model)
+    else:
+        overview = "".join(overviews)
+    bodies = {
+        'Meeting Overview': overview,
+        'Main Topics': "\n".join(sections.get('MAIN_TOPICS', '') for sections in chunk_sections),
+        'Decisions and Impact': "\n".join(sections.get('DECISIONS', '') for sections in chunk_sections),
+        'Action Items': "\n".join(sections.get('ACTIONS', '') for sections in chunk_sections),
+    }
     
-    processed_content = post_process_content(content)
-    structured_content = structure_markdown(processed_content, title, base_name, participants)
+    processed_sections = normalize_sections(bodies)
+    structured_content = structure_markdown(processed_sections, title, base_name, participants)
     
     return structured_content
 
-def save_md_to_file(content, file_path):
+def save_md_to_file(parts, file_path):
     directory = os.path.dirname(file_path)
     if directory:
         os.makedirs(directory, exist_ok=True)
-    with open(file_path, 'w') as f:
-        f.write(content)
-    print(f"Markdown file saved to {file_path}")
-
-def process_files(directory, title):
-    vtt_files = glob.glob(os.path.join(directory, "*.vtt"))
-    for file_path in vtt_files:
-        base_name = os.path.basename(file_path).replace(".vtt", "")
-        csv_file_path = os.path.join(directory, f"{base_name}.csv")
-        participants = read_csv_file(csv_file_path) if os.path.exists(csv_file_path) else []
-        transcript = read_vtt_file(file_path)
-        result = extract_meeting_notes(transcript, participants, title, base_name)
-        timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
-        md_file_path = os.path.join(directory, "md", f"summary_{base_name}_{timestamp}.md")
-        print("\nExtracted Information:")
-        if result:
-            print(result)
-            save_md_to_file(result, md_file_path)
-        else:
-            print("No valid information extracted.")
-        print("Information extraction completed.")
+    with open(file_path, 'w', buffering=2**20) as f:
+        f.writelines(parts)
+    logger.info("Markdown file saved to %s", file_path)
+
+def read_meeting(file_path):
+    base_name = os.path.basename(file_path).replace(".vtt", "")
+    csv_file_path = os.path.join(os.path.dirname(file_path), f"{base_name}.csv")
+    participants = read_csv_file(csv_file_path) if os.path.exists(csv_file_path) else []
+    captions = read_vtt_file(file_path)
+    return base_name, participants, captions
+
+def write_summary(result, file_path, base_name, md_file_path=None, verbose=False):
+    timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
+    if not md_file_path:
+        md_file_path = os.path.join(os.path.dirname(file_path), "md", f"summary_{base_name}_{timestamp}.md")
+    if result:
+        if verbose:
+            print("\nExtracted Information:")
+            print("".join(result))
+        save_md_to_file(result, md_file_path)
+    else:
+        logger.warning("No valid information extracted from %s", file_path)
+    logger.info("Information extraction completed for %s", file_path)
+
+async def process_one_file(file_path, title, md_file_path=None, verbose=False, post_model=local_llm):
+    try:
+        base_name, participants, captions = await asyncio.to_thread(read_meeting, file_path)
+        result = await extract_meeting_notes(captions, participants, title, base_name, post_model)
+        await asyncio.to_thread(write_summary, result, file_path, base_name, md_file_path, verbose)
+    except Exception as e:
+        logger.error("Giving up on %s: %r", file_path, e)
+        return False
+    return True
+
+async def process_files(directory, title, max_concurrency, verbose=False, post_model=local_llm):
+    with os.scandir(directory) as entries:
+        vtt_files = [entry.path for entry in entries if entry.name.endswith(".vtt") and entry.is_file()]
+
+    # Reading, LLM extraction and writing run as separate stages connected by queues, so the
+    # next transcript is parsed and the previous summary written while the LLM is busy.
+    # max_concurrency extractors keep that many transcripts in flight against Ollama.
+    # Each stage catches errors per file, so one bad transcript never stalls the others.
+    read_q = asyncio.Queue(maxsize=max_concurrency)
+    write_q = asyncio.Queue(maxsize=max_concurrency)
+    failed = []
+
+    async def reader():
+        for file_path in vtt_files:
+            try:
+                meeting = await asyncio.to_thread(read_meeting, file_path)
+            except Exception as e:
+                logger.error("Could not read %s: %r", file_path, e)
+                failed.append(file_path)
+                continue
+            await read_q.put((file_path, *meeting))
+        for _ in range(max_concurrency):
+            await read_q.put(None)
+
+    async def extractor():
+        while (item := await read_q.get()) is not None:
+            file_path, base_name, participants, captions = item
+            try:
+                result = await extract_meeting_notes(captions, participants, title, base_name, post_model)
+            except Exception as e:
+                logger.error("Giving up on %s: %r", file_path, e)
+                failed.append(file_path)
+                continue
+            await write_q.put((file_path, base_name, result))
+
+    async def extract_all():
+        await asyncio.gather(*(extractor() for _ in range(max_concurrency)))
+        await write_q.put(None)
+
+    async def writer():
+        while (item := await write_q.get()) is not None:
+            file_path, base_name, result = item
+            try:
+                await asyncio.to_thread(write_summary, result, file_path, base_name, verbose=verbose)
+            except Exception as e:
+                logger.error("Could not write summary for %s: %r", file_path, e)
+                failed.append(file_path)
+
+    await asyncio.gather(reader(), extract_all(), writer())
+
+    if failed:
+        logger.error("Failed to summarize %d of %d files:", len(failed), len(vtt_files))
+        for file_path in failed:
+            logger.error("- %s", file_path)
+    return failed
+
+async def main_async(args):
+    global http_client, llm_slots
+    llm_slots = asyncio.Semaphore(args.concurrency)
+    limits = httpx.Limits(
+        max_connections=args.concurrency * 2,
+        max_keepalive_connections=args.concurrency * 2,
+        keepalive_expiry=60,
+    )
+    # Generation can take minutes, so only bound the time to connect
+    http_client = httpx.AsyncClient(base_url=OLLAMA_HOST, limits=limits, timeout=httpx.Timeout(None, connect=10.0))
+    logger.info("Using LLM for extraction: %s at %s", local_llm, OLLAMA_HOST)
+    try:
+        try:
+            await awarm_up()
+        except httpx.HTTPError as e:
+            logger.error("Could not load %s on Ollama at %s: %r", local_llm, OLLAMA_HOST, e)
+            return 1
+        if args.directory:
+            failed = await process_files(args.directory, args.title, args.concurrency, args.verbose, args.post_model)
+            return 1 if failed else 0
+        ok = await process_one_file(args.input, args.title, args.output_md, args.verbose, args.post_model)
+        return 0 if ok else 1
+    finally:
+        await http_client.aclose()
+
+def positive_int(value):
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return number
 
 def main():
     parser = argparse.ArgumentParser(description="Extract meeting notes from a transcript file or directory.")
@@ -239,32 +510,23 @@ def main():
     parser.add_argument("-m", "--output-md", type=str, default=None, help="Path to save the output Markdown file")
     parser.add_argument("-d", "--directory", type=str, help="Path to the directory containing the transcript files (VTT format)")
     parser.add_argument("-t", "--title", type=str, default="Metaverse Standards Forum", help="Title for the meeting summary")
+    parser.add_argument("-c", "--concurrency", type=positive_int, default=4, help="Number of transcripts to process at once (match OLLAMA_NUM_PARALLEL)")
+    parser.add_argument("--post-model", type=str, default=local_llm, help="Ollama model used to merge the overviews of long, chunked transcripts (defaults to the extraction model)")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Print each generated summary to stdout and enable debug logging")
     args = parser.parse_args()
 
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.INFO, format='%(asctime)s %(levelname)s %(message)s')
+    # httpx logs every request at INFO, which drowns out the per-file progress
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    logging.getLogger("httpcore").setLevel(logging.WARNING)
+
     if args.directory:
-        process_files(args.directory, args.title)
+        sys.exit(asyncio.run(main_async(args)))
     elif args.input:
-        file_path = args.input
-        if not os.path.exists(file_path):
-            print(f"File not found: {file_path}")
+        if not os.path.exists(args.input):
+            logger.error("File not found: %s", args.input)
             return
-        base_name = os.path.basename(file_path).replace(".vtt", "")
-        csv_file_path = os.path.join(os.path.dirname(file_path), f"{base_name}.csv")
-        participants = read_csv_file(csv_file_path) if os.path.exists(csv_file_path) else []
-        transcript = read_vtt_file(file_path)
-        result = extract_meeting_notes(transcript, participants, args.title, base_name)
-        timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
-        if args.output_md:
-            md_file_path = args.output_md
-        else:
-            md_file_path = os.path.join(os.path.dirname(file_path), "md", f"summary_{base_name}_{timestamp}.md")
-        print("\nExtracted Information:")
-        if result:
-            print(result)
-            save_md_to_file(result, md_file_path)
-        else:
-            print("No valid information extracted.")
-        print("Information extraction completed.")
+        sys.exit(asyncio.run(main_async(args)))
     else:
         parser.print_help()
 